@@ -107,6 +107,7 @@ from .expression_tree.operations.evaluate import (
     find_symbols,
     id_to_python_variable,
     to_python,
+    release_dead_variables,
     EvaluatorPython,
 )
 
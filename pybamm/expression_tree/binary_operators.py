@@ -5,7 +5,115 @@ import pybamm
 
 import numpy as np
 import numbers
-from scipy.sparse import issparse, csr_matrix
+import operator
+from scipy.sparse import issparse, isspmatrix_csr, csr_matrix
+
+
+# Pairs of (operator name, child name) for which a binary operator child does not
+# need brackets when printing, see BinaryOperator.__str__
+_LEFT_NO_BRACKETS = frozenset({("/", "*"), ("-", "+")})
+_RIGHT_NO_BRACKETS = frozenset({("*", "*"), ("*", "/")})
+
+# Sentinel for values missing from known_evals, see BinaryOperator.evaluate
+_not_evaluated = object()
+
+
+def _to_csr(matrix):
+    """
+    Convert the result of a sparse elementwise operation to csr format. Unlike
+    `csr_matrix(matrix)`, this returns the matrix itself (without re-wrapping and
+    re-checking it) if it is already in csr format
+    """
+    if issparse(matrix):
+        return matrix.tocsr()
+    return csr_matrix(matrix)
+
+
+def _sparse_multiply(sparse, other):
+    """
+    Elementwise product of a sparse matrix with another object, returned in csr
+    format. If the other object is a dense row or column vector, it is broadcast
+    directly onto the stored entries of the sparse matrix, which avoids the
+    (much slower) sparse diagonal matrix product used by `sparse.multiply`
+    """
+    if isinstance(other, np.ndarray) and other.ndim == 2:
+        n_rows, n_cols = sparse.shape
+        if other.shape == (n_rows, 1) and n_cols != 1:
+            sparse = sparse.tocsr()
+            # each row of the sparse matrix is scaled by an entry of the column
+            scale = np.repeat(np.asarray(other).ravel(), np.diff(sparse.indptr))
+        elif other.shape == (1, n_cols) and n_rows != 1:
+            sparse = sparse.tocsr()
+            # each column of the sparse matrix is scaled by an entry of the row
+            scale = np.asarray(other).ravel()[sparse.indices]
+        else:
+            return _to_csr(sparse.multiply(other))
+        return csr_matrix(
+            (sparse.data * scale, sparse.indices.copy(), sparse.indptr.copy()),
+            shape=sparse.shape,
+        )
+    if _same_sparsity(sparse, other):
+        # the stored entries line up, so multiply them directly
+        return csr_matrix(
+            (sparse.data * other.data, sparse.indices.copy(), sparse.indptr.copy()),
+            shape=sparse.shape,
+        )
+    return _to_csr(sparse.multiply(other))
+
+
+def _same_sparsity(left, right):
+    """
+    Whether two objects are csr matrices in canonical format with the same shape and
+    sparsity pattern, in which case their stored entries correspond one-to-one
+    """
+    if not (isspmatrix_csr(left) and isspmatrix_csr(right)):
+        return False
+    if left.shape != right.shape or left.nnz != right.nnz:
+        return False
+    if not (left.has_canonical_format and right.has_canonical_format):
+        return False
+    same_indptr = left.indptr is right.indptr or np.array_equal(
+        left.indptr, right.indptr
+    )
+    return same_indptr and (
+        left.indices is right.indices or np.array_equal(left.indices, right.indices)
+    )
+
+
+def _select(condition, complement, if_true, if_false):
+    """
+    Expression equal to `if_true` where `condition()` is 1 and to `if_false` where
+    `complement()` is 1, as used for the derivatives of :class:`Minimum` and
+    :class:`Maximum`. If one of the terms is zero, only the comparison for the other
+    term is needed, which saves a comparison and a product.
+    """
+    if pybamm.is_scalar_zero(if_false) or pybamm.is_matrix_zero(if_false):
+        return condition() * if_true
+    elif pybamm.is_scalar_zero(if_true) or pybamm.is_matrix_zero(if_true):
+        return complement() * if_false
+    else:
+        return condition() * if_true + complement() * if_false
+
+
+def _overrides_evaluate(symbol, cls):
+    """
+    Whether the class of symbol overrides `cls._binary_evaluate`, in which case
+    BinaryOperator.evaluate must keep calling `_binary_evaluate` rather than a
+    specialised evaluation picked by `cls.__init__`
+    """
+    return type(symbol)._binary_evaluate is not cls._binary_evaluate
+
+
+def _is_dense_leaf(symbol):
+    "Whether a symbol is a leaf that never evaluates to a sparse matrix"
+    if isinstance(symbol, pybamm.Array):
+        return not issparse(symbol.entries)
+    return isinstance(symbol, (pybamm.Scalar, pybamm.StateVectorBase, pybamm.Time))
+
+
+def _is_sparse_leaf(symbol):
+    "Whether a symbol is a leaf that always evaluates to a sparse matrix"
+    return isinstance(symbol, pybamm.Array) and issparse(symbol.entries)
 
 
 class BinaryOperator(pybamm.Symbol):
@@ -41,6 +149,37 @@ class BinaryOperator(pybamm.Symbol):
         self.left = self.children[0]
         self.right = self.children[1]
 
+        # Bind the methods used by evaluate, which is called very many times, to
+        # avoid repeated attribute lookups
+        self._l_eval = self.left.evaluate
+        self._r_eval = self.right.evaluate
+        self._eval_fn = self._binary_evaluate
+
+        # The value of a constant subtree never changes, so it is saved the first time
+        # it is evaluated and returned directly afterwards (as for pybamm.Array)
+        self._save_value = self.is_constant()
+        self._saved_value = None
+
+    def __copy__(self):
+        """
+        Shallow copy, as used when attaching a symbol as a child. The evaluation
+        method bound to this symbol is rebound to the copy, so that the copy does not
+        keep this symbol alive (or pickle it along with the copy).
+        """
+        out = self.__class__.__new__(self.__class__)
+        out.__dict__.update(self.__dict__)
+        eval_fn = self._eval_fn
+        if getattr(eval_fn, "__self__", None) is self:
+            out._eval_fn = eval_fn.__func__.__get__(out)
+        return out
+
+    def __getstate__(self):
+        # The saved value can be large and is recomputed when needed, so it is not
+        # pickled
+        state = super().__getstate__()
+        state["_saved_value"] = None
+        return state
+
     def format(self, left, right):
         "Format children left and right into compatible form"
         # Turn numbers into scalars
@@ -77,30 +216,36 @@ class BinaryOperator(pybamm.Symbol):
     def __str__(self):
         """ See :meth:`pybamm.Symbol.__str__()`. """
         # Possibly add brackets for clarity
-        if isinstance(self.left, pybamm.BinaryOperator) and not (
-            (self.left.name == self.name)
-            or (self.left.name == "*" and self.name == "/")
-            or (self.left.name == "+" and self.name == "-")
-            or self.name == "+"
+        name = self.name
+        left, right = self.left, self.right
+        if (
+            isinstance(left, pybamm.BinaryOperator)
+            and name != "+"
+            and left.name != name
+            and (name, left.name) not in _LEFT_NO_BRACKETS
         ):
-            left_str = "({!s})".format(self.left)
+            left_str = "({!s})".format(left)
         else:
-            left_str = "{!s}".format(self.left)
-        if isinstance(self.right, pybamm.BinaryOperator) and not (
-            (self.name == "*" and self.right.name in ["*", "/"]) or self.name == "+"
+            left_str = "{!s}".format(left)
+        if (
+            isinstance(right, pybamm.BinaryOperator)
+            and name != "+"
+            and (name, right.name) not in _RIGHT_NO_BRACKETS
         ):
-            right_str = "({!s})".format(self.right)
+            right_str = "({!s})".format(right)
         else:
-            right_str = "{!s}".format(self.right)
-        return "{} {} {}".format(left_str, self.name, right_str)
+            right_str = "{!s}".format(right)
+        return "{} {} {}".format(left_str, name, right_str)
 
     def get_children_domains(self, ldomain, rdomain):
         "Combine domains from children in appropriate way"
-        if ldomain == rdomain:
+        # Children often share the same domain list (e.g. copies of one symbol), in
+        # which case the identity check avoids comparing the lists element-wise
+        if ldomain is rdomain or ldomain == rdomain:
             return ldomain
-        elif ldomain == []:
+        elif not ldomain:
             return rdomain
-        elif rdomain == []:
+        elif not rdomain:
             return ldomain
         else:
             raise pybamm.DomainError(
@@ -114,39 +259,64 @@ class BinaryOperator(pybamm.Symbol):
 
     def new_copy(self):
         """ See :meth:`pybamm.Symbol.new_copy()`. """
-
-        # process children
-        new_left = self.left.new_copy()
-        new_right = self.right.new_copy()
-
-        # make new symbol, ensure domain(s) remain the same
-        out = self._binary_new_copy(new_left, new_right)
-        out.copy_domains(self)
-
-        return out
+        # Expression trees can be very deep, so copy nested binary operators using an
+        # explicit stack (in post-order) rather than recursing into each child
+        copies = []
+        stack = [(self, False)]
+        while stack:
+            symbol, children_copied = stack.pop()
+            if children_copied:
+                new_right = copies.pop()
+                new_left = copies.pop()
+                # make new symbol, ensure domain(s) remain the same
+                out = symbol._binary_new_copy(new_left, new_right)
+                out.copy_domains(symbol)
+                copies.append(out)
+            elif (
+                isinstance(symbol, BinaryOperator)
+                and type(symbol).new_copy is BinaryOperator.new_copy
+            ):
+                stack.append((symbol, True))
+                stack.append((symbol.right, False))
+                stack.append((symbol.left, False))
+            else:
+                copies.append(symbol.new_copy())
+        return copies[0]
 
     def _binary_new_copy(self, left, right):
         "Default behaviour for new_copy"
         return self.__class__(left, right)
 
     def evaluate(self, t=None, y=None, y_dot=None, inputs=None, known_evals=None):
-        """ See :meth:`pybamm.Symbol.evaluate()`. """
-        if known_evals is not None:
-            id = self.id
-            try:
-                return known_evals[id], known_evals
-            except KeyError:
-                left, known_evals = self.left.evaluate(t, y, y_dot, inputs, known_evals)
-                right, known_evals = self.right.evaluate(
-                    t, y, y_dot, inputs, known_evals
+        """
+        See :meth:`pybamm.Symbol.evaluate()`. The value of a constant subtree is saved
+        and returned by every later call (also for copies of this symbol), so it must
+        not be modified in place.
+        """
+        if known_evals is None:
+            value = self._saved_value
+            if value is None:
+                value = self._eval_fn(
+                    self._l_eval(t, y, y_dot, inputs), self._r_eval(t, y, y_dot, inputs)
                 )
-                value = self._binary_evaluate(left, right)
-                known_evals[id] = value
-                return value, known_evals
-        else:
-            left = self.left.evaluate(t, y, y_dot, inputs)
-            right = self.right.evaluate(t, y, y_dot, inputs)
-            return self._binary_evaluate(left, right)
+                if self._save_value:
+                    self._saved_value = value
+            return value
+        id = self._id
+        # Most nodes are only evaluated once per call, so look up with a sentinel
+        # rather than paying for a KeyError on each miss
+        value = known_evals.get(id, _not_evaluated)
+        if value is not _not_evaluated:
+            return value, known_evals
+        value = self._saved_value
+        if value is None:
+            left, known_evals = self._l_eval(t, y, y_dot, inputs, known_evals)
+            right, known_evals = self._r_eval(t, y, y_dot, inputs, known_evals)
+            value = self._eval_fn(left, right)
+            if self._save_value:
+                self._saved_value = value
+        known_evals[id] = value
+        return value, known_evals
 
     def _evaluate_for_shape(self):
         """ See :meth:`pybamm.Symbol.evaluate_for_shape()`. """
@@ -170,13 +340,29 @@ class BinaryOperator(pybamm.Symbol):
 
     def evaluates_on_edges(self, dimension):
         """ See :meth:`pybamm.Symbol.evaluates_on_edges()`. """
-        return self.left.evaluates_on_edges(dimension) or self.right.evaluates_on_edges(
-            dimension
+        # The children can't change, so the result is saved to avoid walking the
+        # tree again each time this is called (e.g. during simplification)
+        try:
+            return self._saved_evaluates_on_edges[dimension]
+        except AttributeError:
+            self._saved_evaluates_on_edges = {}
+        except KeyError:
+            pass
+        on_edges = self.left.evaluates_on_edges(dimension) or (
+            self.right.evaluates_on_edges(dimension)
         )
+        self._saved_evaluates_on_edges[dimension] = on_edges
+        return on_edges
 
     def is_constant(self):
         """ See :meth:`pybamm.Symbol.is_constant()`. """
-        return self.left.is_constant() and self.right.is_constant()
+        try:
+            return self._saved_is_constant
+        except AttributeError:
+            self._saved_is_constant = self.left.is_constant() and (
+                self.right.is_constant()
+            )
+            return self._saved_is_constant
 
 
 class Power(BinaryOperator):
@@ -193,21 +379,28 @@ class Power(BinaryOperator):
         """ See :meth:`pybamm.Symbol._diff()`. """
         # apply chain rule and power rule
         base, exponent = self.orphans
-        # derivative if variable is in the base
-        diff = exponent * (base ** (exponent - 1)) * base.diff(variable)
         # derivative if variable is in the exponent (rare, check separately to avoid
         # unecessarily big tree)
-        if any(variable.id == x.id for x in exponent.pre_order()):
-            diff += (base ** exponent) * pybamm.log(base) * exponent.diff(variable)
-        return diff
+        if variable.id in self.right.pre_order_ids:
+            # base ** (exponent - 1) is common to both terms, so factor it out rather
+            # than also building base ** exponent
+            return base ** (exponent - 1) * (
+                exponent * base.diff(variable)
+                + base * pybamm.log(base) * exponent.diff(variable)
+            )
+        # derivative if variable is only in the base
+        return exponent * (base ** (exponent - 1)) * base.diff(variable)
 
     def _binary_jac(self, left_jac, right_jac):
         """ See :meth:`pybamm.BinaryOperator._binary_jac()`. """
         # apply chain rule and power rule
-        left, right = self.orphans
+        # check for constants on the children themselves, so that they are only
+        # copied if the jacobian is not zero
+        left, right = self.children
         if left.evaluates_to_constant_number() and right.evaluates_to_constant_number():
             return pybamm.Scalar(0)
-        elif right.evaluates_to_constant_number():
+        left, right = self.orphans
+        if right.evaluates_to_constant_number():
             return (right * left ** (right - 1)) * left_jac
         elif left.evaluates_to_constant_number():
             return (left ** right * pybamm.log(left)) * right_jac
@@ -218,6 +411,10 @@ class Power(BinaryOperator):
 
     def _binary_evaluate(self, left, right):
         """ See :meth:`pybamm.BinaryOperator._binary_evaluate()`. """
+        # A positive float base can't give an invalid result, so skip setting the
+        # (comparatively expensive) floating point error state
+        if isinstance(left, np.floating) and left > 0:
+            return left ** right
         # don't raise RuntimeWarning for NaNs
         with np.errstate(invalid="ignore"):
             return left ** right
@@ -232,6 +429,10 @@ class Addition(BinaryOperator):
     def __init__(self, left, right):
         """ See :meth:`pybamm.BinaryOperator.__init__()`. """
         super().__init__("+", left, right)
+        # evaluate with the C-level operator directly rather than through a Python
+        # method call, see BinaryOperator.evaluate
+        if not _overrides_evaluate(self, Addition):
+            self._eval_fn = operator.add
 
     def _diff(self, variable):
         """ See :meth:`pybamm.Symbol._diff()`. """
@@ -262,6 +463,10 @@ class Subtraction(BinaryOperator):
         """ See :meth:`pybamm.BinaryOperator.__init__()`. """
 
         super().__init__("-", left, right)
+        # evaluate with the C-level operator directly rather than through a Python
+        # method call, see BinaryOperator.evaluate
+        if not _overrides_evaluate(self, Subtraction):
+            self._eval_fn = operator.sub
 
     def _diff(self, variable):
         """ See :meth:`pybamm.Symbol._diff()`. """
@@ -296,6 +501,17 @@ class Multiplication(BinaryOperator):
 
         super().__init__("*", left, right)
 
+        # The sparsity of the children is fixed by the tree, so if it is already
+        # known, pick the appropriate evaluation now instead of checking on every call
+        if _overrides_evaluate(self, Multiplication):
+            pass
+        elif _is_sparse_leaf(self.left):
+            self._eval_fn = self._left_sparse_evaluate
+        elif _is_sparse_leaf(self.right):
+            self._eval_fn = self._right_sparse_evaluate
+        elif _is_dense_leaf(self.left) and _is_dense_leaf(self.right):
+            self._eval_fn = operator.mul
+
     def _diff(self, variable):
         """ See :meth:`pybamm.Symbol._diff()`. """
         # apply product rule
@@ -305,27 +521,37 @@ class Multiplication(BinaryOperator):
     def _binary_jac(self, left_jac, right_jac):
         """ See :meth:`pybamm.BinaryOperator._binary_jac()`. """
         # apply product rule
-        left, right = self.orphans
+        # only copy the children that appear in the jacobian
+        left, right = self.children
         if left.evaluates_to_constant_number() and right.evaluates_to_constant_number():
             return pybamm.Scalar(0)
         elif left.evaluates_to_constant_number():
-            return left * right_jac
+            return left.new_copy() * right_jac
         elif right.evaluates_to_constant_number():
-            return right * left_jac
+            return right.new_copy() * left_jac
         else:
+            left, right = self.orphans
             return right * left_jac + left * right_jac
 
     def _binary_evaluate(self, left, right):
         """ See :meth:`pybamm.BinaryOperator._binary_evaluate()`. """
 
         if issparse(left):
-            return csr_matrix(left.multiply(right))
+            return _sparse_multiply(left, right)
         elif issparse(right):
             # Hadamard product is commutative, so we can switch right and left
-            return csr_matrix(right.multiply(left))
+            return _sparse_multiply(right, left)
         else:
             return left * right
 
+    def _left_sparse_evaluate(self, left, right):
+        "Evaluate when left is known to be sparse"
+        return _sparse_multiply(left, right)
+
+    def _right_sparse_evaluate(self, left, right):
+        "Evaluate when right is known to be sparse"
+        return _sparse_multiply(right, left)
+
     def _binary_simplify(self, left, right):
         """ See :meth:`pybamm.BinaryOperator._binary_simplify()`. """
         return pybamm.simplify_multiplication_division(self.__class__, left, right)
@@ -342,6 +568,12 @@ class MatrixMultiplication(BinaryOperator):
 
         super().__init__("@", left, right)
 
+    def __getstate__(self):
+        # The saved jacobian matrix is rebuilt when needed, so it is not pickled
+        state = super().__getstate__()
+        state.pop("_saved_left_csr", None)
+        return state
+
     def diff(self, variable):
         """ See :meth:`pybamm.Symbol.diff()`. """
         # We shouldn't need this
@@ -354,12 +586,17 @@ class MatrixMultiplication(BinaryOperator):
         # We only need the case where left is an array and right
         # is a (slice of a) state vector, e.g. for discretised spatial
         # operators of the form D @ u (also catch cases of (-D) @ u)
-        left, right = self.orphans
+        left = self.left
         if isinstance(left, pybamm.Array) or (
             isinstance(left, pybamm.Negate) and isinstance(left.child, pybamm.Array)
         ):
-            left = pybamm.Matrix(csr_matrix(left.evaluate()))
-            return left @ right_jac
+            # left is constant, so the sparse matrix only needs to be built once
+            try:
+                left_csr = self._saved_left_csr
+            except AttributeError:
+                left_csr = pybamm.Matrix(csr_matrix(left.evaluate()))
+                self._saved_left_csr = left_csr
+            return left_csr @ right_jac
         else:
             raise NotImplementedError(
                 """jac of 'MatrixMultiplication' is only
@@ -388,6 +625,14 @@ class Division(BinaryOperator):
         """ See :meth:`pybamm.BinaryOperator.__init__()`. """
         super().__init__("/", left, right)
 
+        # See Multiplication.__init__
+        if _overrides_evaluate(self, Division):
+            pass
+        elif _is_sparse_leaf(self.left):
+            self._eval_fn = self._sparse_evaluate
+        elif _is_dense_leaf(self.left):
+            self._eval_fn = self._dense_evaluate
+
     def _diff(self, variable):
         """ See :meth:`pybamm.Symbol._diff()`. """
         # apply quotient rule
@@ -397,13 +642,15 @@ class Division(BinaryOperator):
     def _binary_jac(self, left_jac, right_jac):
         """ See :meth:`pybamm.BinaryOperator._binary_jac()`. """
         # apply quotient rule
-        left, right = self.orphans
+        # only copy the children that appear in the jacobian
+        left, right = self.children
         if left.evaluates_to_constant_number() and right.evaluates_to_constant_number():
             return pybamm.Scalar(0)
-        elif left.evaluates_to_constant_number():
-            return -left / right ** 2 * right_jac
         elif right.evaluates_to_constant_number():
-            return left_jac / right
+            return left_jac / right.new_copy()
+        left, right = self.orphans
+        if left.evaluates_to_constant_number():
+            return -left / right ** 2 * right_jac
         else:
             return (right * left_jac - left * right_jac) / right ** 2
 
@@ -411,14 +658,22 @@ class Division(BinaryOperator):
         """ See :meth:`pybamm.BinaryOperator._binary_evaluate()`. """
 
         if issparse(left):
-            return csr_matrix(left.multiply(1 / right))
+            return self._sparse_evaluate(left, right)
         else:
-            if isinstance(right, numbers.Number) and right == 0:
-                # don't raise RuntimeWarning for NaNs
-                with np.errstate(invalid="ignore"):
-                    return left * np.inf
-            else:
-                return left / right
+            return self._dense_evaluate(left, right)
+
+    def _sparse_evaluate(self, left, right):
+        "Evaluate when left is known to be sparse"
+        return _sparse_multiply(left, 1 / right)
+
+    def _dense_evaluate(self, left, right):
+        "Evaluate when left is known to be dense"
+        if isinstance(right, numbers.Number) and right == 0:
+            # don't raise RuntimeWarning for NaNs
+            with np.errstate(invalid="ignore"):
+                return left * np.inf
+        else:
+            return left / right
 
     def _binary_simplify(self, left, right):
         """ See :meth:`pybamm.BinaryOperator._binary_simplify()`. """
@@ -456,24 +711,26 @@ class Inner(BinaryOperator):
     def _binary_jac(self, left_jac, right_jac):
         """ See :meth:`pybamm.BinaryOperator._binary_jac()`. """
         # apply product rule
-        left, right = self.orphans
+        # only copy the children that appear in the jacobian
+        left, right = self.children
         if left.evaluates_to_constant_number() and right.evaluates_to_constant_number():
             return pybamm.Scalar(0)
         elif left.evaluates_to_constant_number():
-            return left * right_jac
+            return left.new_copy() * right_jac
         elif right.evaluates_to_constant_number():
-            return right * left_jac
+            return right.new_copy() * left_jac
         else:
+            left, right = self.orphans
             return right * left_jac + left * right_jac
 
     def _binary_evaluate(self, left, right):
         """ See :meth:`pybamm.BinaryOperator._binary_evaluate()`. """
 
         if issparse(left):
-            return left.multiply(right)
+            return _sparse_multiply(left, right)
         elif issparse(right):
             # Hadamard product is commutative, so we can switch right and left
-            return right.multiply(left)
+            return _sparse_multiply(right, left)
         else:
             return left * right
 
@@ -556,6 +813,9 @@ class EqualHeaviside(Heaviside):
 
     def _binary_evaluate(self, left, right):
         """ See :meth:`pybamm.BinaryOperator._binary_evaluate()`. """
+        # comparing scalars doesn't raise RuntimeWarning for NaNs
+        if isinstance(left, numbers.Number) and isinstance(right, numbers.Number):
+            return left <= right
         # don't raise RuntimeWarning for NaNs
         with np.errstate(invalid="ignore"):
             return left <= right
@@ -573,6 +833,9 @@ class NotEqualHeaviside(Heaviside):
 
     def _binary_evaluate(self, left, right):
         """ See :meth:`pybamm.BinaryOperator._binary_evaluate()`. """
+        # comparing scalars doesn't raise RuntimeWarning for NaNs
+        if isinstance(left, numbers.Number) and isinstance(right, numbers.Number):
+            return left < right
         # don't raise RuntimeWarning for NaNs
         with np.errstate(invalid="ignore"):
             return left < right
@@ -592,19 +855,21 @@ class Modulo(BinaryOperator):
         diff = left.diff(variable)
         # derivative if variable is in the right term (rare, check separately to avoid
         # unecessarily big tree)
-        if any(variable.id == x.id for x in right.pre_order()):
+        if variable.id in self.right.pre_order_ids:
             diff += -pybamm.Floor(left / right) * right.diff(variable)
         return diff
 
     def _binary_jac(self, left_jac, right_jac):
         """ See :meth:`pybamm.BinaryOperator._binary_jac()`. """
         # apply chain rule and power rule
-        left, right = self.orphans
+        # only copy the children that appear in the jacobian
+        left, right = self.children
         if left.evaluates_to_constant_number() and right.evaluates_to_constant_number():
             return pybamm.Scalar(0)
         elif right.evaluates_to_constant_number():
             return left_jac
-        elif left.evaluates_to_constant_number():
+        left, right = self.orphans
+        if left.evaluates_to_constant_number():
             return -right_jac * pybamm.Floor(left / right)
         else:
             return left_jac - right_jac * pybamm.Floor(left / right)
@@ -631,17 +896,31 @@ class Minimum(BinaryOperator):
     def _diff(self, variable):
         """ See :meth:`pybamm.Symbol._diff()`. """
         left, right = self.orphans
-        return (left <= right) * left.diff(variable) + (left > right) * right.diff(
-            variable
+        return _select(
+            lambda: left <= right,
+            lambda: left > right,
+            left.diff(variable),
+            right.diff(variable),
         )
 
     def _binary_jac(self, left_jac, right_jac):
         """ See :meth:`pybamm.BinaryOperator._binary_jac()`. """
         left, right = self.orphans
-        return (left <= right) * left_jac + (left > right) * right_jac
+        return _select(
+            lambda: left <= right, lambda: left > right, left_jac, right_jac
+        )
 
     def _binary_evaluate(self, left, right):
         """ See :meth:`pybamm.BinaryOperator._binary_evaluate()`. """
+        # np.minimum has a large overhead for scalars, so compare them directly
+        if isinstance(left, numbers.Number) and isinstance(right, numbers.Number):
+            if left <= right:
+                return left
+            elif left > right:
+                return right
+            else:
+                # at least one of left and right is NaN, return NaN like np.minimum
+                return left + right
         # don't raise RuntimeWarning for NaNs
         return np.minimum(left, right)
 
@@ -659,17 +938,30 @@ class Maximum(BinaryOperator):
     def _diff(self, variable):
         """ See :meth:`pybamm.Symbol._diff()`. """
         left, right = self.orphans
-        return (left >= right) * left.diff(variable) + (left < right) * right.diff(
-            variable
+        return _select(
+            lambda: left >= right,
+            lambda: left < right,
+            left.diff(variable),
+            right.diff(variable),
         )
 
     def _binary_jac(self, left_jac, right_jac):
         """ See :meth:`pybamm.BinaryOperator._binary_jac()`. """
         left, right = self.orphans
-        return (left >= right) * left_jac + (left < right) * right_jac
+        return _select(
+            lambda: left >= right, lambda: left < right, left_jac, right_jac
+        )
 
     def _binary_evaluate(self, left, right):
         """ See :meth:`pybamm.BinaryOperator._binary_evaluate()`. """
+        # See Minimum._binary_evaluate
+        if isinstance(left, numbers.Number) and isinstance(right, numbers.Number):
+            if left >= right:
+                return left
+            elif left < right:
+                return right
+            else:
+                return left + right
         # don't raise RuntimeWarning for NaNs
         return np.maximum(left, right)
 
@@ -709,7 +1001,12 @@ def softminus(left, right, k):
     Softplus approximation to the minimum function. k is the smoothing parameter,
     set by `pybamm.settings.min_smoothing`. The recommended value is k=10.
     """
-    return pybamm.log(pybamm.exp(-k * left) + pybamm.exp(-k * right)) / -k
+    # Write in terms of the exact minimum (logsumexp trick), so that the exponential
+    # cannot overflow for large k * left or k * right. The exact minimum is written
+    # symmetrically as (left + right - |left - right|) / 2, so that its jacobian is
+    # the average of the jacobians of left and right when left = right
+    d = pybamm.AbsoluteValue(left - right)
+    return (left + right) / 2 - d / 2 - pybamm.log(1 + pybamm.exp(-k * d)) / k
 
 
 def softplus(left, right, k):
@@ -717,7 +1014,9 @@ def softplus(left, right, k):
     Softplus approximation to the maximum function. k is the smoothing parameter,
     set by `pybamm.settings.max_smoothing`. The recommended value is k=10.
     """
-    return pybamm.log(pybamm.exp(k * left) + pybamm.exp(k * right)) / k
+    # Write in terms of the exact maximum, as in softminus
+    d = pybamm.AbsoluteValue(left - right)
+    return (left + right) / 2 + d / 2 + pybamm.log(1 + pybamm.exp(-k * d)) / k
 
 
 def sigmoid(left, right, k):
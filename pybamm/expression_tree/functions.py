@@ -97,7 +97,7 @@ class Function(pybamm.Symbol):
             for i, child in enumerate(self.children):
                 # if variable appears in the function, differentiate
                 # function, and apply chain rule
-                if variable.id in [symbol.id for symbol in child.pre_order()]:
+                if variable.id in child.pre_order_ids:
                     partial_derivatives[i] = self._function_diff(
                         children, i
                     ) * child.diff(variable)
@@ -8,6 +8,7 @@ import scipy.sparse
 from collections import OrderedDict
 
 import numbers
+import re
 from platform import system
 
 if system() != "Windows":
@@ -291,6 +292,8 @@ def find_symbols(symbol, constant_symbols, variable_symbols, output_jax=False):
             symbol_str = "{}[{}:{}]".format(
                 children_vars[0], symbol.slice.start, symbol.slice.stop
             )
+        elif isinstance(symbol, pybamm.AbsoluteValue):
+            symbol_str = "np.abs({})".format(children_vars[0])
         else:
             symbol_str = symbol.name + children_vars[0]
 
@@ -434,6 +437,46 @@ def to_python(symbol, debug=False, output_jax=False):
     return constant_values, "\n".join(variable_lines)
 
 
+def release_dead_variables(python_str, result_var):
+    """
+    Add `del` statements to code generated by :func:`to_python`, so that each
+    intermediate variable is released straight after the last line that uses it.
+    Otherwise every intermediate result stays alive until the generated function
+    returns; releasing them early lets numpy recycle their memory for the results
+    computed later on, which reduces the peak memory of a call.
+
+    Parameters
+    ----------
+    python_str : str
+        The code generated by :func:`to_python`, one assignment per line
+    result_var : str
+        The name of the variable that is returned, which is never released
+
+    Returns
+    -------
+    str:
+        The code with `del` statements added
+    """
+    lines = python_str.split("\n")
+    defined = {line.split(" = ", 1)[0] for line in lines}
+    last_use = {}
+    for i, line in enumerate(lines):
+        for name in re.findall(r"\bvar_\w+", line):
+            if name in defined:
+                last_use[name] = i
+    last_use.pop(result_var, None)
+
+    released = [[] for _ in lines]
+    for name, i in last_use.items():
+        released[i].append(name)
+    new_lines = []
+    for line, names in zip(lines, released):
+        new_lines.append(line)
+        if names:
+            new_lines.append("del " + ", ".join(sorted(names)))
+    return "\n".join(new_lines)
+
+
 class EvaluatorPython:
     """
     Converts a pybamm expression tree into pure python code that will calculate the
@@ -451,6 +494,10 @@ class EvaluatorPython:
     def __init__(self, symbol):
         constants, python_str = pybamm.to_python(symbol, debug=False)
 
+        # release intermediate results as soon as they are no longer needed
+        result_var = id_to_python_variable(symbol.id, symbol.is_constant())
+        python_str = release_dead_variables(python_str, result_var)
+
         # extract constants in generated function
         for i, symbol_id in enumerate(constants.keys()):
             const_name = id_to_python_variable(symbol_id, True)
@@ -469,9 +516,7 @@ class EvaluatorPython:
             "y_dot=None, inputs=None, known_evals=None):\n" + python_str
         )
 
-        # calculate the final variable that will output the result of calling `evaluate`
-        # on `symbol`
-        result_var = id_to_python_variable(symbol.id, symbol.is_constant())
+        # output the result of calling `evaluate` on `symbol`
         if symbol.is_constant():
             result_value = symbol.evaluate()
 
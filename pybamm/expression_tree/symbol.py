@@ -496,19 +496,19 @@ class Symbol(anytree.NodeMixin):
         "Combine auxiliary domains from children, at all levels"
         aux_domains = {}
         for child in children:
-            for level in child.auxiliary_domains.keys():
+            for level, child_domain in child.auxiliary_domains.items():
+                domain = aux_domains.get(level)
                 if (
-                    level not in aux_domains
-                    or aux_domains[level] == []
-                    or child.auxiliary_domains[level] == aux_domains[level]
+                    domain is None
+                    or domain is child_domain
+                    or domain == []
+                    or child_domain == domain
                 ):
-                    aux_domains[level] = child.auxiliary_domains[level]
+                    aux_domains[level] = child_domain
                 else:
                     raise pybamm.DomainError(
                         """children must have same or empty auxiliary domains,
-                        not {!s} and {!s}""".format(
-                            aux_domains[level], child.auxiliary_domains[level]
-                        )
+                        not {!s} and {!s}""".format(domain, child_domain)
                     )
 
         return aux_domains
@@ -632,6 +632,35 @@ class Symbol(anytree.NodeMixin):
         """
         return anytree.PreOrderIter(self)
 
+    @property
+    def pre_order_ids(self):
+        """
+        Frozenset of the ids of all the nodes in the tree (including this one), for
+        fast membership tests such as checking whether a variable appears in an
+        expression. Saved after the first call, since ids are immutable.
+        """
+        try:
+            return self._saved_pre_order_ids
+        except AttributeError:
+            self._saved_pre_order_ids = frozenset(x.id for x in self.pre_order())
+            return self._saved_pre_order_ids
+
+    def __copy__(self):
+        """
+        Shallow copy, as used when attaching a symbol as a child. This copies the
+        instance dict directly, rather than going through :meth:`__getstate__`,
+        which is only meant for pickling.
+        """
+        out = self.__class__.__new__(self.__class__)
+        out.__dict__.update(self.__dict__)
+        return out
+
+    def __getstate__(self):
+        # The saved ids are recomputed when needed, so they are not pickled
+        state = self.__dict__.copy()
+        state.pop("_saved_pre_order_ids", None)
+        return state
+
     def __str__(self):
         """return a string representation of the node and its children"""
         return self._name
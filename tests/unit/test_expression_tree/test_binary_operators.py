@@ -3,8 +3,12 @@
 #
 import pybamm
 
+import copy
 import numpy as np
+import pickle
 import unittest
+import warnings
+from scipy.sparse import csr_matrix
 from scipy.sparse.coo import coo_matrix
 
 
@@ -21,6 +25,54 @@ class TestBinaryOperators(unittest.TestCase):
         with self.assertRaises(NotImplementedError):
             bin2.evaluate()
 
+    def test_copy(self):
+        a = pybamm.Scalar(2)
+        b = pybamm.StateVector(slice(0, 1))
+        m = pybamm.Matrix(csr_matrix(np.ones((1, 1))))
+        for expr in [
+            pybamm.Power(a, b),
+            pybamm.Multiplication(m, b),
+            pybamm.Multiplication(b, m),
+            pybamm.Division(b, a),
+            pybamm.Division(m, a),
+        ]:
+            # the evaluation method is bound to the copy, not the original
+            expr_copy = copy.copy(expr)
+            self.assertIs(expr_copy._eval_fn.__self__, expr_copy)
+            child = pybamm.Negate(expr).child
+            self.assertIs(child._eval_fn.__self__, child)
+
+    def test_is_constant_evaluates_on_edges(self):
+        a = pybamm.Scalar(1)
+        b = pybamm.StateVector(slice(0, 1))
+        var = pybamm.Variable("var", domain="negative electrode")
+        grad = pybamm.grad(var)
+        for expr, constant, edges in [
+            (a + a, True, False),
+            (a + b, False, False),
+            (a * grad, False, True),
+        ]:
+            # calling twice uses the saved result
+            for _ in range(2):
+                self.assertEqual(expr.is_constant(), constant)
+                self.assertEqual(expr.evaluates_on_edges("primary"), edges)
+
+    def test_new_copy(self):
+        a = pybamm.Variable("a", domain="negative electrode")
+        b = pybamm.Scalar(2)
+        expr = pybamm.Addition(-a * b, pybamm.Function(np.sin, a) / b)
+        new_expr = expr.new_copy()
+        self.assertEqual(new_expr.id, expr.id)
+        self.assertEqual(new_expr.domain, ["negative electrode"])
+        self.assertIsNot(new_expr.children[0], expr.children[0])
+
+        # deep trees are copied without recursing into every binary operator
+        y = pybamm.StateVector(slice(0, 1))
+        expr = y
+        for i in range(5000):
+            expr = pybamm.Addition(expr, y)
+        self.assertEqual(expr.new_copy().id, expr.id)
+
     def test_binary_operator_domains(self):
         # same domain
         a = pybamm.Symbol("a", domain=["negative electrode"])
@@ -45,6 +97,14 @@ class TestBinaryOperators(unittest.TestCase):
         self.assertEqual(summ.children[0].name, a.name)
         self.assertEqual(summ.children[1].name, b.name)
 
+        # numbers are converted to scalars
+        self.assertEqual(pybamm.Addition(a, 1).children[1].id, pybamm.Scalar(1).id)
+        self.assertEqual(pybamm.Addition(a, 1.0).children[1].id, pybamm.Scalar(1).id)
+        self.assertEqual(pybamm.Addition(a, 0.1).children[1].id, pybamm.Scalar(0.1).id)
+        # each conversion gives a new scalar, so domains cannot leak between trees
+        pybamm.Addition(a, 1).children[1].domain = ["negative electrode"]
+        self.assertEqual(pybamm.Addition(a, 1).children[1].domain, [])
+
         # test simplifying
         summ2 = pybamm.Scalar(1) + pybamm.Scalar(3)
         self.assertEqual(summ2.id, pybamm.Scalar(4).id)
@@ -62,6 +122,17 @@ class TestBinaryOperators(unittest.TestCase):
         pow2 = pybamm.Power(a, b)
         self.assertEqual(pow2.evaluate(), 16)
 
+        # invalid results give NaN without warning
+        c = pybamm.InputParameter("c")
+        pow3 = pybamm.Power(c, pybamm.Scalar(0.5))
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            self.assertEqual(pow3.evaluate(inputs={"c": np.float64(4)}), 2)
+            self.assertTrue(np.isnan(pow3.evaluate(inputs={"c": np.float64(-4)})))
+            self.assertTrue(
+                np.isnan(pow3.evaluate(inputs={"c": np.array([-4.0])})).all()
+            )
+
     def test_known_eval(self):
         # Scalars
         a = pybamm.Scalar(4)
@@ -89,6 +160,67 @@ class TestBinaryOperators(unittest.TestCase):
             (a @ b).evaluate(y=y_test),
         )
 
+        # Repeated subtrees are only evaluated once if known_evals is given
+        class CountedAddition(pybamm.Addition):
+            count = 0
+
+            def _binary_evaluate(self, left, right):
+                CountedAddition.count += 1
+                return super()._binary_evaluate(left, right)
+
+        a = pybamm.Scalar(4)
+        b = pybamm.StateVector(slice(0, 1))
+        summ = CountedAddition(a, b)
+        expr3 = pybamm.Multiplication(summ, summ)
+        self.assertEqual(expr3.evaluate(y=np.array([2])), 36)
+        self.assertEqual(CountedAddition.count, 2)
+        self.assertEqual(expr3.evaluate(y=np.array([2]), known_evals={})[0], 36)
+        self.assertEqual(CountedAddition.count, 3)
+
+        # Symbols with the same id are not confused without known_evals
+        expr5 = pybamm.Function(lambda x: x, b) + pybamm.Function(lambda x: -x, b)
+        self.assertEqual(expr5.children[0].id, expr5.children[1].id)
+        self.assertEqual(expr5.evaluate(y=np.array([2])), 0)
+
+        # Subclasses that override _binary_evaluate are not bypassed by the
+        # specialised evaluation of their parent class
+        class DoubledMultiplication(pybamm.Multiplication):
+            def _binary_evaluate(self, left, right):
+                return 2 * super()._binary_evaluate(left, right)
+
+        self.assertEqual(DoubledMultiplication(a, b).evaluate(y=np.array([2])), 16)
+
+    def test_saved_value_pickling(self):
+        class CountedAddition(pybamm.Addition):
+            count = 0
+
+            def _binary_evaluate(self, left, right):
+                CountedAddition.count += 1
+                return super()._binary_evaluate(left, right)
+
+        a = pybamm.Scalar(4)
+        b = pybamm.StateVector(slice(0, 1))
+
+        # Constant subtrees are only evaluated once, even across calls
+        summ = CountedAddition(a, pybamm.Scalar(2))
+        expr = pybamm.Multiplication(summ, b)
+        self.assertEqual(expr.evaluate(y=np.array([2])), 12)
+        self.assertEqual(expr.evaluate(y=np.array([3])), 18)
+        self.assertEqual(CountedAddition.count, 1)
+
+        # nodes that have not been evaluated yet can be pickled
+        summ = pickle.loads(pickle.dumps(pybamm.Addition(a, pybamm.Scalar(2))))
+        self.assertEqual(summ.evaluate(), 6)
+
+        # saved values are not pickled
+        summ = pybamm.Addition(a, pybamm.Scalar(2))
+        self.assertEqual(summ.evaluate(), 6)
+        self.assertEqual(len(summ.pre_order_ids), 3)
+        state = summ.__getstate__()
+        self.assertIsNone(state["_saved_value"])
+        self.assertNotIn("_saved_pre_order_ids", state)
+        self.assertEqual(pickle.loads(pickle.dumps(summ)).evaluate(), 6)
+
     def test_diff(self):
         a = pybamm.StateVector(slice(0, 1))
         b = pybamm.StateVector(slice(1, 2))
@@ -102,6 +234,11 @@ class TestBinaryOperators(unittest.TestCase):
             (a ** a).diff(a).evaluate(y=y), 5 ** 5 * np.log(5) + 5 * 5 ** 4
         )
         self.assertEqual((a ** a).diff(b).evaluate(y=y), 0)
+        # only one power node is created when differentiating through the exponent
+        diff = (a ** a).diff(a)
+        self.assertEqual(
+            sum(isinstance(x, pybamm.Power) for x in diff.pre_order()), 1
+        )
 
         # addition
         self.assertEqual((a + b).diff(a).evaluate(), 1)
@@ -221,6 +358,41 @@ class TestBinaryOperators(unittest.TestCase):
         np.testing.assert_array_equal(
             (pybammS2 * pybammD2).evaluate().toarray(), S2.toarray() * D2
         )
+        # Sparse elementwise products are always returned in csr format
+        self.assertIsInstance((pybammS1 * pybammS1).evaluate(), csr_matrix)
+        self.assertIsInstance((2 * pybammD1 * pybammS1).evaluate(), csr_matrix)
+        self.assertIsInstance((pybammS1 * (2 * pybammD1)).evaluate(), csr_matrix)
+
+        # csr matrices with the same or different sparsity patterns
+        C1 = csr_matrix(S1)
+        C2 = csr_matrix((np.arange(1, 5), C1.indices, C1.indptr), shape=C1.shape)
+        C3 = csr_matrix(np.eye(4, 5))
+        for other in [C1, C2, C3]:
+            for expr in [
+                pybamm.Matrix(C1) * pybamm.Matrix(other),
+                pybamm.Inner(pybamm.Matrix(C1), pybamm.Matrix(other)),
+            ]:
+                result = expr.evaluate()
+                self.assertIsInstance(result, csr_matrix)
+                np.testing.assert_array_equal(
+                    result.toarray(), C1.multiply(other).toarray()
+                )
+
+        # Multiplication by a row or column vector is broadcast
+        col = np.arange(1, 5)[:, np.newaxis]
+        row = np.arange(1, 6)[np.newaxis, :]
+        for v in [col, row]:
+            pybammv = pybamm.Matrix(v)
+            np.testing.assert_array_equal(
+                (pybammS1 * pybammv).evaluate().toarray(), S1.toarray() * v
+            )
+            np.testing.assert_array_equal(
+                (pybammv * pybammS1).evaluate().toarray(), S1.toarray() * v
+            )
+            np.testing.assert_array_equal(
+                (pybammS1 / pybammv).evaluate().toarray(), S1.toarray() / v
+            )
+
         with self.assertRaisesRegex(pybamm.ShapeError, "inconsistent shapes"):
             (pybammS1 * pybammS2).test_shape()
         with self.assertRaisesRegex(pybamm.ShapeError, "inconsistent shapes"):
@@ -256,6 +428,7 @@ class TestBinaryOperators(unittest.TestCase):
         np.testing.assert_array_equal(
             (pybammS1 / pybammv1).evaluate().toarray(), S1.toarray() / v1
         )
+        self.assertIsInstance((pybammS1 / pybammv1).evaluate(), csr_matrix)
 
     def test_inner(self):
         model = pybamm.lithium_ion.BaseModel()
@@ -321,6 +494,16 @@ class TestBinaryOperators(unittest.TestCase):
         self.assertEqual(heav.evaluate(y=np.array([0])), 1)
         self.assertEqual(str(heav), "y[0:1] <= 1.0")
 
+        # scalars and NaNs
+        c = pybamm.InputParameter("c")
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            for heav in [a < c, a >= c]:
+                self.assertFalse(heav.evaluate(inputs={"c": np.nan}))
+                self.assertFalse(heav.evaluate(inputs={"c": np.array([np.nan])})[0])
+            self.assertTrue((a < c).evaluate(inputs={"c": 2}))
+            self.assertTrue((a >= c).evaluate(inputs={"c": np.float64(1)}))
+
     def test_sigmoid(self):
         a = pybamm.Scalar(1)
         b = pybamm.StateVector(slice(0, 1))
@@ -362,6 +545,17 @@ class TestBinaryOperators(unittest.TestCase):
         self.assertEqual(maximum.evaluate(y=np.array([0])), 1)
         self.assertEqual(str(maximum), "maximum(1.0, y[0:1])")
 
+        # scalars, including NaN
+        c = pybamm.InputParameter("c")
+        minimum = pybamm.Minimum(a, c)
+        maximum = pybamm.Maximum(a, c)
+        self.assertEqual(minimum.evaluate(inputs={"c": 2}), 1)
+        self.assertEqual(minimum.evaluate(inputs={"c": 0}), 0)
+        self.assertEqual(maximum.evaluate(inputs={"c": 2}), 2)
+        self.assertEqual(maximum.evaluate(inputs={"c": 0}), 1)
+        self.assertTrue(np.isnan(minimum.evaluate(inputs={"c": np.nan})))
+        self.assertTrue(np.isnan(maximum.evaluate(inputs={"c": np.nan})))
+
     def test_softminus_softplus(self):
         a = pybamm.Scalar(1)
         b = pybamm.StateVector(slice(0, 1))
@@ -371,7 +565,8 @@ class TestBinaryOperators(unittest.TestCase):
         self.assertAlmostEqual(minimum.evaluate(y=np.array([0]))[0, 0], 0)
         self.assertEqual(
             str(minimum),
-            "log(1.9287498479639178e-22 + exp(-50.0 * y[0:1])) / -50.0",
+            "((1.0 + y[0:1]) / 2.0) - (abs(1.0 - y[0:1]) / 2.0) - "
+            "(log(1.0 + exp(-50.0 * abs(1.0 - y[0:1]))) / 50.0)",
         )
 
         maximum = pybamm.softplus(a, b, 50)
@@ -379,7 +574,38 @@ class TestBinaryOperators(unittest.TestCase):
         self.assertAlmostEqual(maximum.evaluate(y=np.array([0]))[0, 0], 1)
         self.assertEqual(
             str(maximum),
-            "log(5.184705528587072e+21 + exp(50.0 * y[0:1])) / 50.0",
+            "(1.0 + y[0:1]) / 2.0 + abs(1.0 - y[0:1]) / 2.0 + "
+            "log(1.0 + exp(-50.0 * abs(1.0 - y[0:1]))) / 50.0",
+        )
+
+        # No overflow for large arguments
+        self.assertAlmostEqual(minimum.evaluate(y=np.array([-1000]))[0, 0], -1000)
+        self.assertAlmostEqual(maximum.evaluate(y=np.array([1000]))[0, 0], 1000)
+        self.assertAlmostEqual(
+            minimum.evaluate(y=np.array([1]))[0, 0], 1 - np.log(2) / 50
+        )
+        self.assertAlmostEqual(
+            maximum.evaluate(y=np.array([1]))[0, 0], 1 + np.log(2) / 50
+        )
+
+        # Jacobians
+        self.assertAlmostEqual(minimum.jac(b).evaluate(y=np.array([1]))[0, 0], 0.5)
+        self.assertAlmostEqual(maximum.jac(b).evaluate(y=np.array([1]))[0, 0], 0.5)
+        self.assertAlmostEqual(maximum.jac(b).evaluate(y=np.array([2]))[0, 0], 1)
+        y = np.array([1.01])
+        self.assertAlmostEqual(
+            minimum.jac(b).evaluate(y=y)[0, 0], 1 / (1 + np.exp(0.5))
+        )
+        self.assertAlmostEqual(
+            maximum.jac(b).evaluate(y=y)[0, 0], 1 / (1 + np.exp(-0.5))
+        )
+        # at a tie, both sides contribute equally to the jacobian
+        y_tie = np.array([0.5])
+        self.assertAlmostEqual(
+            pybamm.softplus(b, 0, 10).jac(b).evaluate(y=np.array([0]))[0, 0], 0.5
+        )
+        self.assertAlmostEqual(
+            pybamm.softminus(b, 1 - b, 10).jac(b).evaluate(y=y_tie).toarray()[0, 0], 0
         )
 
         # Test that smooth min/max are used when the setting is changed
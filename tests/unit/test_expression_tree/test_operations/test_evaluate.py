@@ -298,6 +298,29 @@ class TestEvaluate(unittest.TestCase):
 
         self.assertRegex(variable_str, expected_str)
 
+    def test_release_dead_variables(self):
+        a = pybamm.StateVector(slice(0, 1))
+        b = pybamm.StateVector(slice(1, 2))
+        expr = (a + b) * a
+        _, variable_str = pybamm.to_python(expr)
+        result_var = pybamm.id_to_python_variable(expr.id)
+        a_var = pybamm.id_to_python_variable(a.id)
+        b_var = pybamm.id_to_python_variable(b.id)
+        sum_var = pybamm.id_to_python_variable((a + b).id)
+
+        # each intermediate is released after its last use, but not the result
+        lines = pybamm.release_dead_variables(variable_str, result_var).split("\n")
+        self.assertEqual(len(lines), 6)
+        self.assertEqual(lines[3], "del " + b_var)
+        self.assertEqual(lines[5], "del " + ", ".join(sorted([a_var, sum_var])))
+        self.assertNotIn(result_var, lines[5])
+
+        # the generated code still gives the same result
+        evaluator = pybamm.EvaluatorPython(expr)
+        self.assertIn("del ", evaluator._python_str)
+        y = np.array([[2], [3]])
+        np.testing.assert_array_equal(evaluator.evaluate(y=y), expr.evaluate(y=y))
+
     def test_evaluator_python(self):
         a = pybamm.StateVector(slice(0, 1))
         b = pybamm.StateVector(slice(1, 2))
@@ -380,6 +403,13 @@ class TestEvaluate(unittest.TestCase):
             result = evaluator.evaluate(t=t, y=y)
             np.testing.assert_allclose(result, expr.evaluate(t=t, y=y))
 
+        # test smooth minimum/maximum, which use an absolute value
+        expr = pybamm.softminus(a, b, 10) + pybamm.softplus(a, b, 10)
+        evaluator = pybamm.EvaluatorPython(expr)
+        for t, y in zip(t_tests, y_tests):
+            result = evaluator.evaluate(t=t, y=y)
+            np.testing.assert_allclose(result, expr.evaluate(t=t, y=y))
+
         # test something with an index
         expr = pybamm.Index(A @ pybamm.StateVector(slice(0, 2)), 0)
         evaluator = pybamm.EvaluatorPython(expr)
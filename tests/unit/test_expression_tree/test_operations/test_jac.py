@@ -53,6 +53,19 @@ class TestJacobian(unittest.TestCase):
         jacobian = np.array([[2, 0, 0, 0], [0, 2, 0, 0]])
         dfunc_dy = func.jac(y).simplify().evaluate(y=y0)
         np.testing.assert_array_equal(jacobian, dfunc_dy.toarray())
+        # the sparse left matrix is reused for later jacobians
+        dfunc_dv = func.jac(v).simplify().evaluate(y=y0)
+        np.testing.assert_array_equal(np.zeros((2, 2)), dfunc_dv.toarray())
+        dfunc_dy = func.jac(y).simplify().evaluate(y=y0)
+        np.testing.assert_array_equal(jacobian, dfunc_dy.toarray())
+        # but is not pickled
+        self.assertIn("_saved_left_csr", func.__dict__)
+        self.assertNotIn("_saved_left_csr", func.__getstate__())
+
+        func = -A @ u
+        jacobian = np.array([[-2, 0, 0, 0], [0, -2, 0, 0]])
+        dfunc_dy = func.jac(y).simplify().evaluate(y=y0)
+        np.testing.assert_array_equal(jacobian, dfunc_dy.toarray())
 
         func = u @ pybamm.StateVector(slice(0, 1))
         with self.assertRaises(NotImplementedError):
@@ -336,6 +349,39 @@ class TestJacobian(unittest.TestCase):
             np.diag(pybamm.maximum(1, y ** 2).jac(y).evaluate(y=y_test).toarray()),
             2 * y_test * (y_test > 1),
         )
+        # both terms depend on y
+        np.testing.assert_array_almost_equal(
+            np.diag(pybamm.minimum(y, y ** 2).jac(y).evaluate(y=y_test).toarray()),
+            np.where(y_test ** 2 < y_test, 2 * y_test, 1),
+        )
+        np.testing.assert_array_almost_equal(
+            np.diag(pybamm.maximum(y, y ** 2).jac(y).evaluate(y=y_test).toarray()),
+            np.where(y_test ** 2 > y_test, 2 * y_test, 1),
+        )
+        # the selected derivative is exact, even if the other one is much larger
+        y_test = np.linspace(1, 2, 10)
+        np.testing.assert_array_equal(
+            pybamm.Minimum(y, 1e17 * y).jac(y).evaluate(y=y_test).toarray(),
+            np.eye(10),
+        )
+        np.testing.assert_array_equal(
+            pybamm.Maximum(y, -1e17 * y).jac(y).evaluate(y=y_test).toarray(),
+            np.eye(10),
+        )
+        # the jacobians of the two terms have different shapes
+        y_test = np.linspace(0, 2, 10)
+        y0 = pybamm.StateVector(slice(0, 1))
+        right_jac = np.zeros((10, 10))
+        right_jac[:, 0] = 2
+        np.testing.assert_array_equal(
+            pybamm.minimum(y, 2 * y0).jac(y).evaluate(y=y_test).toarray(),
+            np.where(y_test[:, None] <= 2 * y_test[0], np.eye(10), right_jac),
+        )
+        y_test = np.linspace(2, 0, 10)
+        np.testing.assert_array_equal(
+            pybamm.maximum(y, 2 * y0).jac(y).evaluate(y=y_test).toarray(),
+            np.where(y_test[:, None] >= 2 * y_test[0], np.eye(10), right_jac),
+        )
 
     def test_jac_of_abs(self):
         y = pybamm.StateVector(slice(0, 10))
@@ -3,9 +3,11 @@
 #
 import pybamm
 
+import copy
 import unittest
 import numpy as np
 import os
+import pickle
 from scipy.sparse import coo_matrix
 
 
@@ -197,6 +199,17 @@ class TestSymbol(unittest.TestCase):
         for node, expect in zip(exp.pre_order(), expected_preorder):
             self.assertEqual(node.name, expect)
 
+        self.assertEqual(exp.pre_order_ids, {node.id for node in exp.pre_order()})
+        self.assertIn(a.id, exp.pre_order_ids)
+        self.assertNotIn(pybamm.Symbol("d").id, exp.pre_order_ids)
+
+        # the saved ids are kept by copies, but not pickled
+        neg = pybamm.Negate(a)
+        ids = neg.pre_order_ids
+        self.assertIs(copy.copy(neg).pre_order_ids, ids)
+        self.assertNotIn("_saved_pre_order_ids", neg.__getstate__())
+        self.assertEqual(pickle.loads(pickle.dumps(neg)).pre_order_ids, ids)
+
     def test_symbol_diff(self):
         a = pybamm.Symbol("a")
         b = pybamm.Symbol("b")